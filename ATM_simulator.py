@@ -1,48 +1,625 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import csv
+from array import array
 import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+from instrumentation import instrument
+
+# numpy is optional: Bank.replay uses it for the vectorized pass, otherwise it replays row by row.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 class InsufficientFundError(Exception):
     pass
 
+# Mini-statement entry kept raw until someone asks for it: (epoch, kind, amount, balance)
+StatementEntry = Tuple[float, str, float, float]
+
+_KIND_LABELS = {"open": "Opening: ", "deposit": "Deposit: +", "withdraw": "withdraw:-", "replay": "Replay net: "}
+
+
+def _format_entry(epoch: float, kind: str, amount: float, balance: float) -> str:
+    timestamp = datetime.datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+    return f"{timestamp} | {_KIND_LABELS[kind]}{amount:.2f} | Balance: {balance:.2f}"
+
+
 class Account:
     def __init__(self,owner:str,opening_balance:float=0.0,mini_limit:int=5):
         self.owner=owner
         self._balance=float(opening_balance)
         self._mini_limit=int(mini_limit)
-        self._mini_statement:List[str]=[]
-
-    def _record(self,description:str)->None:
-        timestamp=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry=f"{timestamp} | {description}"
-        self._mini_statement.append(entry)
-        if len(self._mini_statement)>self._mini_limit:
-            self._mini_statement.pop(0)
+        # fixed-capacity ring buffer; _mini_head is the next slot to overwrite
+        self._mini_ring:List[Optional[StatementEntry]]=[None]*max(self._mini_limit,0)
+        self._mini_head=0
+        self._mini_count=0
+        # reentrant so Bank.transfer can hold it across withdraw()/deposit()
+        self._lock=threading.RLock()
+
+    def _record(self,kind:str,amount:float)->None:
+        if self._mini_limit<=0:
+            return
+        self._mini_ring[self._mini_head]=(time.time(),kind,amount,self._balance)
+        self._mini_head=(self._mini_head+1)%self._mini_limit
+        if self._mini_count<self._mini_limit:
+            self._mini_count+=1
+
+    @instrument("Account.deposit")
     def deposit(self,amount:float)->float:
         if amount<=0:
             raise ValueError("Deposit amount must be positive.")
-        self._balance+=amount
-        self._record(f"Deposit: +{amount:.2f} | Balance: {self._balance:.2f}")
-        return self._balance
+        with self._lock:
+            self._balance+=amount
+            self._record("deposit",amount)
+            return self._balance
     
+    @instrument("Account.withdraw")
     def withdraw(self,amount:float)->float:
         if amount<=0:
             raise ValueError("withdrawal amount must be positive.")
-        if amount>self._balance:
-            raise InsufficientFundError(f"Insufficient funds: attempted to withdraw{amount:.2f},available {self._balance:.2f}")
-        self._balance-=amount
-        self._record(f"withdraw:-{amount:.2f} | Balance: {self._balance:.2f}")
-        return self._balance
+        with self._lock:
+            if amount>self._balance:
+                raise InsufficientFundError(f"Insufficient funds: attempted to withdraw{amount:.2f},available {self._balance:.2f}")
+            self._balance-=amount
+            self._record("withdraw",amount)
+            return self._balance
     
     def get_balance(self)->float:
         return float(self._balance)
     
     def mini_statement(self)->List[str]:
-        return list(reversed(self._mini_statement))
+        # walk backwards from the newest slot, formatting only what is returned
+        out=[]
+        for k in range(1,self._mini_count+1):
+            epoch,kind,amount,balance=self._mini_ring[(self._mini_head-k)%self._mini_limit]
+            out.append(_format_entry(epoch,kind,amount,balance))
+        return out
+
+# ---------------- Ledger mode ----------------
+# Journal record: (seq, epoch, kind, amount_cents, balance_cents)
+JournalRecord = Tuple[int, float, str, int, int]
+
+def to_cents(amount) -> int:
+    """Convert a rupee amount to integer paise, rounding half-up."""
+    try:
+        return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Invalid amount: {amount}") from None
+
+
+# below this many rows numpy's setup costs more than it saves: Bank.replay skips it and
+# Bank._replay_vectorized hands its last few unsettled rows to a plain loop
+_REPLAY_TAIL_ROWS = 2048
+
+
+def _parse_cents(text: str) -> int:
+    """to_cents for CSV amount text, skipping Decimal for plain ``123`` / ``123.4`` / ``123.45``."""
+    whole, _, frac = text.partition(".")
+    if whole.isdigit() and len(frac) <= 2 and (frac.isdigit() or not frac):
+        return int(whole) * 100 + (int(frac.ljust(2, "0")) if frac else 0)
+    return to_cents(text)
+
+
+class TransactionJournal:
+    """Append-only transaction journal with group commit and snapshots.
+
+    ``append`` queues a record and ``sync`` blocks until it is on disk. The
+    first waiting caller becomes the leader and writes + fsyncs everything
+    queued so far in one go; callers that queue meanwhile wait and are
+    covered by the next fsync, so concurrent transactions share fsyncs
+    without anyone being acknowledged early. If a write or fsync fails, the
+    partial batch is truncated away, every queued record is dropped and the
+    journal refuses further use; reopening it recovers the durable state.
+    Every ``snapshot_every`` records
+    a small JSON snapshot (seq, balance, journal offset) is written, letting
+    startup replay only the journal tail.
+    """
+    def __init__(self, path: str, snapshot_every: int = 100_000):
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.snapshot_every = max(1, int(snapshot_every))
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._pending_records: List[JournalRecord] = []
+        self._flushing = False
+        self._failed: Optional[BaseException] = None
+        self._since_snapshot = 0
+        self.seq = 0
+        self.balance_cents = 0
+        self._recover()
+        self._durable_seq = self.seq
+        self._durable_balance = self.balance_cents
+        # unbuffered, so a failed batch can be cut off with ftruncate
+        self._f = open(self.path, "ab", buffering=0)
+
+    def _recover(self) -> None:
+        offset = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            self.seq, self.balance_cents, offset = snap["seq"], snap["balance_cents"], snap["offset"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        good = tail.rfind(b"\n") + 1
+        seq, balance = self.seq, self.balance_cents
+        for line in tail[:good].decode("ascii").splitlines():
+            seq_s, _, kind, amount_s, balance_s = line.split(",")
+            amount = int(amount_s)
+            balance = balance - amount if kind == "withdraw" else balance + amount
+            if balance != int(balance_s):
+                raise ValueError(f"journal {self.path} is inconsistent at seq {seq_s}")
+            seq = int(seq_s)
+        self.seq, self.balance_cents = seq, balance
+        self._since_snapshot = tail.count(b"\n", 0, good)
+        if good < len(tail):
+            # drop a torn record left by a crash mid-write
+            with open(self.path, "r+b") as f:
+                f.truncate(offset + good)
+
+    def append(self, kind: str, amount_cents: int, balance_cents: int) -> JournalRecord:
+        """Queue a record; it is durable only once ``sync(record[0])`` returns."""
+        with self._cond:
+            if self._f.closed:
+                raise ValueError(f"journal {self.path} is closed")
+            self._check_failed()
+            self.seq += 1
+            self.balance_cents = balance_cents
+            record = (self.seq, time.time(), kind, amount_cents, balance_cents)
+            self._pending.append(f"{record[0]},{record[1]:.6f},{kind},{amount_cents},{balance_cents}\n")
+            self._pending_records.append(record)
+            return record
+
+    def sync(self, seq: int) -> None:
+        """Block until every record up to ``seq`` has been written and fsync'd."""
+        with self._cond:
+            while self._durable_seq < seq:
+                self._check_failed()
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                self._flush_locked()
+
+    def _check_failed(self) -> None:
+        if self._failed is not None:
+            raise OSError(f"journal {self.path} failed to write ({self._failed}); reopen it to recover")
+
+    def _flush_locked(self) -> None:
+        # called with _cond held; drops it while writing so others can keep queueing
+        batch, records = self._pending, self._pending_records
+        self._pending, self._pending_records = [], []
+        self._flushing = True
+        start = self._f.tell()
+        self._cond.release()
+        try:
+            data = memoryview("".join(batch).encode("ascii"))
+            while data:
+                data = data[self._f.write(data):]
+            os.fsync(self._f.fileno())
+        except BaseException as e:
+            self._cond.acquire()
+            self._fail_locked(e, start)
+            raise
+        self._cond.acquire()
+        self._flushing = False
+        self._durable_seq = records[-1][0]
+        self._durable_balance = records[-1][4]
+        self._since_snapshot += len(records)
+        if self._since_snapshot >= self.snapshot_every:
+            self._snapshot_locked()
+        self._cond.notify_all()
+
+    def _fail_locked(self, error: BaseException, start: int) -> None:
+        # none of the failed batch was acknowledged: cut it off so it is never written twice,
+        # drop whatever queued behind it and fall back to the last durable state
+        try:
+            os.ftruncate(self._f.fileno(), start)
+        except OSError:
+            pass
+        self._failed = error
+        self._pending, self._pending_records = [], []
+        self.seq, self.balance_cents = self._durable_seq, self._durable_balance
+        self._flushing = False
+        self._cond.notify_all()
+
+    def commit(self) -> None:
+        self.sync(self.seq)
+
+    def _snapshot_locked(self) -> None:
+        snap = {"seq": self._durable_seq, "balance_cents": self._durable_balance, "offset": self._f.tell()}
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snap, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self._since_snapshot = 0
+
+    def snapshot(self) -> None:
+        self.commit()
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._snapshot_locked()
+
+    def tail(self, n: int) -> List[JournalRecord]:
+        """Last ``n`` records (oldest first), including queued ones."""
+        if n <= 0:
+            return []
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            records = list(self._pending_records[-n:])
+            need = n - len(records)
+            if need <= 0:
+                return records
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                pos = f.tell()
+                data = b""
+                while pos > 0 and data.count(b"\n") <= need:
+                    step = min(pos, 8192)
+                    pos -= step
+                    f.seek(pos)
+                    data = f.read(step) + data
+        lines = data.decode("ascii").splitlines()[-need:] if data else []
+        committed = []
+        for line in lines:
+            seq_s, epoch_s, kind, amount_s, balance_s = line.split(",")
+            committed.append((int(seq_s), float(epoch_s), kind, int(amount_s), int(balance_s)))
+        return committed + records
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        try:
+            self.commit()
+        finally:
+            with self._cond:
+                self._f.close()
+
+
+class LedgerAccount(Account):
+    """Account that keeps its balance in integer paise and journals every transaction.
+
+    State survives restarts: the balance is rebuilt from the snapshot plus the
+    journal tail, and the mini-statement is read back from the journal.
+    """
+    def __init__(self, owner: str, journal_path: str, opening_balance: float = 0.0, mini_limit: int = 5, **journal_opts):
+        super().__init__(owner, 0.0, mini_limit)
+        self.journal = TransactionJournal(journal_path, **journal_opts)
+        if self.journal.seq == 0 and opening_balance:
+            opening = to_cents(opening_balance)
+            if opening < 0:
+                raise ValueError("Opening balance cannot be negative.")
+            self.journal.sync(self.journal.append("open", opening, opening)[0])
+        self._balance_cents = self.journal.balance_cents
+
+    def deposit(self, amount: float) -> float:
+        if amount <= 0:
+            raise ValueError("Deposit amount must be positive.")
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Deposit amount must be at least 0.01.")
+        with self._lock:
+            record = self.journal.append("deposit", cents, self._balance_cents + cents)
+            self._balance_cents = record[4]
+        # wait for durability outside the account lock so concurrent callers share one fsync
+        self._sync(record)
+        return record[4] / 100
+
+    def withdraw(self, amount: float) -> float:
+        if amount <= 0:
+            raise ValueError("withdrawal amount must be positive.")
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("withdrawal amount must be at least 0.01.")
+        with self._lock:
+            if cents > self._balance_cents:
+                raise InsufficientFundError(f"Insufficient funds: attempted to withdraw{amount:.2f},available {self.get_balance():.2f}")
+            record = self.journal.append("withdraw", cents, self._balance_cents - cents)
+            self._balance_cents = record[4]
+        self._sync(record)
+        return record[4] / 100
+
+    def _sync(self, record: JournalRecord) -> None:
+        try:
+            self.journal.sync(record[0])
+        except BaseException:
+            # the journal dropped every unacknowledged record; match its durable balance
+            with self._lock:
+                self._balance_cents = self.journal.balance_cents
+            raise
+
+    def get_balance(self) -> float:
+        return self._balance_cents / 100
+
+    def get_balance_cents(self) -> int:
+        return self._balance_cents
+
+    def mini_statement(self) -> List[str]:
+        return [_format_entry(r[1], r[2], r[3] / 100, r[4] / 100) for r in reversed(self.journal.tail(self._mini_limit))]
+
+    def close(self) -> None:
+        with self._lock:
+            self.journal.close()
+
+    def __enter__(self) -> "LedgerAccount":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------- Multi-account bank ----------------
+# Transaction tuple for Bank.process: (kind, account_id, amount[, to_account_id])
+Transaction = Tuple
+
+
+class Bank:
+    """Many accounts, each guarded by its own lock.
+
+    Transfers lock both accounts in account-id order so two opposite
+    transfers can never deadlock. ``process`` runs a batch of transactions
+    on a thread pool; ``replay`` bulk-applies a CSV transaction file.
+    """
+    def __init__(self):
+        self.accounts: Dict[str, Account] = {}
+        self._registry_lock = threading.Lock()
+
+    def open_account(self, account_id: str, owner: str, opening_balance: float = 0.0, mini_limit: int = 5) -> Account:
+        with self._registry_lock:
+            if account_id in self.accounts:
+                raise ValueError(f"Account {account_id} already exists.")
+            acct = Account(owner, opening_balance, mini_limit)
+            self.accounts[account_id] = acct
+            return acct
+
+    def add_account(self, account_id: str, acct: Account) -> None:
+        with self._registry_lock:
+            if account_id in self.accounts:
+                raise ValueError(f"Account {account_id} already exists.")
+            self.accounts[account_id] = acct
+
+    def get(self, account_id: str) -> Account:
+        try:
+            return self.accounts[account_id]
+        except KeyError:
+            raise KeyError(f"No account with id {account_id}") from None
+
+    def deposit(self, account_id: str, amount: float) -> float:
+        return self.get(account_id).deposit(amount)
+
+    def withdraw(self, account_id: str, amount: float) -> float:
+        return self.get(account_id).withdraw(amount)
+
+    def get_balance(self, account_id: str) -> float:
+        return self.get(account_id).get_balance()
+
+    def transfer(self, from_id: str, to_id: str, amount: float) -> Tuple[float, float]:
+        if from_id == to_id:
+            raise ValueError("Cannot transfer to the same account.")
+        # convert once so both sides move the same whole-paise amount
+        cents = to_cents(amount)
+        if cents <= 0:
+            raise ValueError("Transfer amount must be at least 0.01.")
+        amount = cents / 100
+        src, dst = self.get(from_id), self.get(to_id)
+        first, second = (src, dst) if from_id < to_id else (dst, src)
+        with first._lock, second._lock:
+            src.withdraw(amount)
+            try:
+                dst.deposit(amount)
+            except BaseException:
+                # put the money back so a failed transfer leaves both balances unchanged
+                src.deposit(amount)
+                raise
+            return src.get_balance(), dst.get_balance()
+
+    def _apply(self, txn: Transaction):
+        kind = txn[0]
+        if kind == "deposit":
+            return self.deposit(txn[1], txn[2])
+        if kind == "withdraw":
+            return self.withdraw(txn[1], txn[2])
+        if kind == "transfer":
+            return self.transfer(txn[1], txn[3], txn[2])
+        raise ValueError(f"Unknown transaction kind: {kind}")
+
+    def process(self, transactions: Iterable[Transaction], workers: int = 8) -> List[object]:
+        """Apply transactions concurrently; each result is the new balance or the raised exception."""
+        def run(txn: Transaction):
+            try:
+                return self._apply(txn)
+            except (ValueError, KeyError, InsufficientFundError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, transactions))
+
+    # bulk replay
+    @staticmethod
+    def _read_transaction_file(path: str) -> Tuple[List[str], "array[int]", "array[int]"]:
+        """Read ``account_id,kind,amount`` rows.
+
+        Returns the distinct account ids (first-seen order) plus, per row, the
+        index of its account in that list and the signed amount in paise, as
+        int64 arrays that numpy can wrap without copying.
+        """
+        names: List[str] = []
+        code_of: Dict[str, int] = {}
+        codes = array("q")
+        deltas = array("q")
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for lineno, row in enumerate(csv.reader(f), start=1):
+                if not row or (lineno == 1 and row[0] == "account_id"):
+                    continue
+                account_id, kind, amount = row
+                cents = _parse_cents(amount)
+                if cents <= 0:
+                    raise ValueError(f"{path}:{lineno}: amount must be positive.")
+                if kind == "deposit":
+                    deltas.append(cents)
+                elif kind == "withdraw":
+                    deltas.append(-cents)
+                else:
+                    raise ValueError(f"{path}:{lineno}: unknown transaction kind {kind!r}")
+                code = code_of.get(account_id)
+                if code is None:
+                    code = code_of[account_id] = len(names)
+                    names.append(account_id)
+                codes.append(code)
+        return names, codes, deltas
+
+    def replay(self, path: str) -> List[int]:
+        """Apply a transaction file in order and return the row numbers (0-based)
+        of withdrawals rejected with InsufficientFundError.
+
+        Plain Accounts are replayed in integer paise: each touched balance is
+        settled to whole paise first and a withdrawal is rejected if it would take
+        that paise balance below zero, so the result does not depend on float
+        rounding or on whether numpy is installed. Each plain account gets one
+        "Replay net" mini-statement entry rather than one per row. With numpy,
+        plain accounts are replayed entirely with cumulative sums (see
+        _replay_vectorized). Other account types (e.g. LedgerAccount) go
+        through their own deposit()/withdraw().
+        """
+        names, codes, deltas = self._read_transaction_file(path)
+        unknown = set(names) - self.accounts.keys()
+        if unknown:
+            raise KeyError(f"No account with id {sorted(unknown)[0]}")
+        accounts = [self.accounts[a] for a in names]
+        locks = [self.accounts[a]._lock for a in sorted(names)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            # paise balance per account code; None for accounts replayed through their own methods
+            balances: List[Optional[int]] = [to_cents(acct.get_balance()) if type(acct) is Account else None
+                                             for acct in accounts]
+            if NUMPY_AVAILABLE and len(codes) > _REPLAY_TAIL_ROWS:
+                rejected = self._replay_vectorized(codes, deltas, balances)
+                slow = {code for code, bal in enumerate(balances) if bal is None}
+                slow_rows = [row for row, code in enumerate(codes) if code in slow] if slow else []
+            else:
+                rejected = []
+                slow_rows = range(len(codes))
+            for row in slow_rows:
+                code, cents = codes[row], deltas[row]
+                bal = balances[code]
+                if bal is not None:
+                    if bal + cents < 0:
+                        rejected.append(row)
+                    else:
+                        balances[code] = bal + cents
+                    continue
+                try:
+                    if cents > 0:
+                        accounts[code].deposit(cents / 100)
+                    else:
+                        accounts[code].withdraw(-cents / 100)
+                except InsufficientFundError:
+                    rejected.append(row)
+            for acct, cents in zip(accounts, balances):
+                if cents is None:
+                    continue
+                net = cents / 100 - acct._balance
+                acct._balance = cents / 100
+                # one summary entry so the mini-statement agrees with get_balance()
+                acct._record("replay", net)
+            return sorted(rejected)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @staticmethod
+    def _replay_vectorized(codes: "array[int]", deltas: "array[int]", balances: List[Optional[int]]) -> List[int]:
+        """Replay every row of the plain accounts (non-None ``balances``) with numpy,
+        updating ``balances`` in place; return the rejected rows.
+
+        Rows are grouped by account and each round takes a per-account
+        cumulative sum over the rows not yet settled. Everything before an
+        account's first overdrawing withdrawal is settled into its balance, that
+        withdrawal is rejected, and only the rows after it go into the next
+        round. The number of rounds is the largest number of rejections in any
+        single account.
+        """
+        plain = np.array([b is not None for b in balances])
+        opening = np.array([b or 0 for b in balances], dtype=np.int64)
+        code_arr = np.frombuffer(codes, dtype=np.int64)
+        delta_arr = np.frombuffer(deltas, dtype=np.int64)
+        # stable sort groups rows by account and keeps file order within each; small ints sort fastest
+        key = code_arr.astype(np.int16 if len(balances) < 2 ** 15 else np.int32)
+        if plain.all():
+            rows = np.argsort(key, kind="stable")
+        else:
+            rows = np.flatnonzero(plain[code_arr])
+            rows = rows[np.argsort(key[rows], kind="stable")]
+        codes_s = code_arr[rows]
+        delta_s = delta_arr[rows]
+        rejected = []
+        active = np.arange(len(rows))
+        c, d = codes_s, delta_s
+        while active.size > _REPLAY_TAIL_ROWS:
+            new_group = np.r_[True, c[1:] != c[:-1]]
+            starts = np.flatnonzero(new_group)
+            ends = np.r_[starts[1:], len(c)]
+            group = np.cumsum(new_group) - 1
+            running = np.cumsum(d)
+            # restart the running sum at each account's first active row
+            running -= np.r_[0, running[starts[1:] - 1]][group]
+            bad = np.flatnonzero((d < 0) & (opening[c] + running < 0))
+            if not bad.size:
+                opening[c[starts]] += running[ends - 1]
+                active = active[:0]
+                break
+            # first overdrawing withdrawal of each account that has one
+            bad = bad[np.r_[True, group[bad[1:]] != group[bad[:-1]]]]
+            cut = ends.copy()
+            cut[group[bad]] = bad
+            # settle each account's rows before its cut (the running sum there is their total)
+            has_prefix = cut > starts
+            opening[c[starts[has_prefix]]] += running[cut[has_prefix] - 1]
+            rejected.extend(rows[active[bad]].tolist())
+            # rows after each rejected withdrawal go to the next round (cut == ends elsewhere)
+            active = active[np.arange(len(c)) > cut[group]]
+            c, d = codes_s[active], delta_s[active]
+
+        # a handful of rows left: finish them one by one (they are still in per-account order)
+        tail_balances = opening.tolist()
+        for i, code, cents in zip(active.tolist(), c.tolist(), d.tolist()):
+            if tail_balances[code] + cents < 0:
+                rejected.append(int(rows[i]))
+            else:
+                tail_balances[code] += cents
+
+        for code in np.flatnonzero(plain).tolist():
+            balances[code] = tail_balances[code]
+        return rejected
+
 
 def main():
     print("Simple ATM Simulator")
     name=input("enter account owner name:").strip() or "User"
-    acct=Account(owner=name,opening_balance=0.0,mini_limit=5)
+    # optional: python ATM_simulator.py <journal_file> to run in ledger mode
+    journal_path:Optional[str]=sys.argv[1] if len(sys.argv)>1 else None
+    if journal_path:
+        acct=LedgerAccount(owner=name,journal_path=journal_path,mini_limit=5)
+    else:
+        acct=Account(owner=name,opening_balance=0.0,mini_limit=5)
 
     menu=(
         "\nChoose an option:\n"
@@ -54,40 +631,45 @@ def main():
         "Enter choice: "
     )
     
-    while True:
-        choice=input(menu).strip()
-        if choice=="1":
-            print(f"current balance:Rs {acct.get_balance():.2f}")
-        elif choice=="2":
-            try:
-                amt=float(input("Enter deposit amount:").strip())
-                new_bal=acct.deposit(amt)
-                print(f"Deposited {amt:.2f}. New balance:Rs {new_bal:2f}")
-            except ValueError as ve:
-                print("Error:",ve)
-        elif choice=="3":
-            try:
-                amt=float(input("Enter withdrawal amount:").strip())
-                new_bal=acct.withdraw(amt)
-                print(f"withdrawm{amt:.2f}. New balance:Rs{new_bal:.2f}")
-            except ValueError as ve:
-                print("Error:",ve)
-            except InsufficientFundError as ie:
-                print("Transaction failed:",ie)
-        elif choice=="4":
-            print("\n---Mini-Statement(most recent first)---")
-            entries=acct.mini_statement()
-            if not entries:
-                print("No transaction yet.")
-            else:
-                for e in entries:
-                    print(e)
-            print("------------------------------------------")
+    # ledger transactions are fsync'd before they are acknowledged; closing also covers Ctrl-C/EOF
+    try:
+        while True:
+            choice=input(menu).strip()
+            if choice=="1":
+                print(f"current balance:Rs {acct.get_balance():.2f}")
+            elif choice=="2":
+                try:
+                    amt=float(input("Enter deposit amount:").strip())
+                    new_bal=acct.deposit(amt)
+                    print(f"Deposited {amt:.2f}. New balance:Rs {new_bal:2f}")
+                except ValueError as ve:
+                    print("Error:",ve)
+            elif choice=="3":
+                try:
+                    amt=float(input("Enter withdrawal amount:").strip())
+                    new_bal=acct.withdraw(amt)
+                    print(f"withdrawm{amt:.2f}. New balance:Rs{new_bal:.2f}")
+                except ValueError as ve:
+                    print("Error:",ve)
+                except InsufficientFundError as ie:
+                    print("Transaction failed:",ie)
+            elif choice=="4":
+                print("\n---Mini-Statement(most recent first)---")
+                entries=acct.mini_statement()
+                if not entries:
+                    print("No transaction yet.")
+                else:
+                    for e in entries:
+                        print(e)
+                print("------------------------------------------")
 
-        elif choice=="5":
-            print("Goodbye.")
-            break
-        else:
-            print("Invalid choice.Try again.")
+            elif choice=="5":
+                print("Goodbye.")
+                break
+            else:
+                print("Invalid choice.Try again.")
+    finally:
+        if isinstance(acct,LedgerAccount):
+            acct.close()
 if __name__=="__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 #HR Employee Management System (classes + Inheritance +Polymorphism)
 from typing import Dict,Any,List,Optional
+from instrumentation import instrument
 #defining a class called Employee
 
 class Employee:
@@ -70,6 +71,7 @@ class HRSystem:
     def list_employees(self)->None:
         for e in self.employees:
             print(f"{e}->Slary: ${e.calculate_salary()}")
+    @instrument("HRSystem.total_payroll")
     def total_payroll(self)->float:
         return round(sum(e.calculate_salary() for e in self.employees),2)
 
@@ -1,6 +1,8 @@
 import csv
 from typing import List, Optional
 
+from instrumentation import file_bytes, instrument
+
 class Theater:
     def __init__(
         self,
@@ -54,6 +56,7 @@ class Theater:
             price = price * (1 - self.student_discount_pct / 100.0)
         return round(price, 2)
 
+    @instrument("Theater.book_seat")
     def book_seat(self, name: str, row: int, seat: int, is_student: bool = False) -> Optional[dict]:
         if not (1 <= row <= self.rows and 1 <= seat <= self.seats_per_row):
             print("Error: row or seat number out of range.")
@@ -73,7 +76,7 @@ class Theater:
             "student": "Yes" if is_student else "No",
         }
 
-        with open(self.bookings_file, "a", newline="") as f:
+        with open(self.bookings_file, "a", newline="") as f, file_bytes("Theater.book_seat", f):
             writer = csv.writer(f)
             writer.writerow([booking["name"], booking["row"], booking["seat"], booking["price"], booking["student"]])
 
@@ -0,0 +1,57 @@
+# Per-transaction overhead of Account deposit/withdraw and mini-statement reads.
+# Usage: python bench_atm.py [transactions] [mini_limit ...]
+import datetime
+import sys
+import time
+from typing import List
+
+from ATM_simulator import Account
+
+
+class EagerAccount(Account):
+    """Old behaviour for comparison: format every entry up front, trim with pop(0)."""
+    def __init__(self, owner: str, opening_balance: float = 0.0, mini_limit: int = 5):
+        super().__init__(owner, opening_balance, mini_limit)
+        self._mini_statement: List[str] = []
+
+    def _record(self, kind: str, amount: float) -> None:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        label = "Deposit: +" if kind == "deposit" else "withdraw:-"
+        self._mini_statement.append(f"{timestamp} | {label}{amount:.2f} | Balance: {self._balance:.2f}")
+        if len(self._mini_statement) > self._mini_limit:
+            self._mini_statement.pop(0)
+
+    def mini_statement(self) -> List[str]:
+        return list(reversed(self._mini_statement))
+
+
+def run(cls, n: int, mini_limit: int) -> float:
+    acct = cls("bench", opening_balance=1_000_000.0, mini_limit=mini_limit)
+    start = time.perf_counter()
+    for i in range(n):
+        if i & 1:
+            acct.withdraw(1.25)
+        else:
+            acct.deposit(2.5)
+    return (time.perf_counter() - start) * 1e9 / n
+
+
+def main(argv: List[str]) -> None:
+    n = int(argv[0]) if argv else 200_000
+    limits = [int(a) for a in argv[1:]] or [5, 1_000, 100_000]
+    print(f"{n} transactions, ns per transaction")
+    print(f"{'mini_limit':>10} {'ring buffer':>12} {'eager':>12}")
+    for limit in limits:
+        print(f"{limit:>10} {run(Account, n, limit):>12.0f} {run(EagerAccount, n, limit):>12.0f}")
+
+    acct = Account("bench", mini_limit=5)
+    for _ in range(5):
+        acct.deposit(1.0)
+    start = time.perf_counter()
+    for _ in range(10_000):
+        acct.mini_statement()
+    print(f"\nmini_statement() with 5 entries: {(time.perf_counter() - start) * 1e6 / 10_000:.2f} us/call")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
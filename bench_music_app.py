@@ -0,0 +1,105 @@
+# Micro-benchmarks for the Playlist containers in music_app.py, against a plain list.
+# Usage: python bench_music_app.py [size ...]
+import random
+import sys
+import time
+from collections import deque
+from typing import Callable, List
+
+from music_app import Playlist, RecentlyPlayed, Song, SongList
+
+
+def make_songs(n: int) -> List[Song]:
+    return [Song((f"Song {i}", f"Artist {i % 97}", 120 + i % 240)) for i in range(n)]
+
+
+def timed(ops: int, fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e6 / ops
+
+
+def row(label: str, ops: int, ours: float, baseline: float) -> None:
+    print(f"  {label:<24} {ops:>7} ops  {ours:10.2f} us/op  {baseline:10.2f} us/op  {baseline / ours:7.1f}x")
+
+
+def positional_ops(container, songs: List[Song], ops: int, seed: int) -> List[float]:
+    rng = random.Random(seed)
+
+    def insert_middle():
+        for s in songs[:ops]:
+            container.insert(len(container) // 2, s)
+
+    def get_random():
+        for _ in range(ops):
+            container[rng.randrange(len(container))]
+
+    def pop_random():
+        for _ in range(ops):
+            container.pop(rng.randrange(len(container)))
+
+    return [timed(ops, insert_middle), timed(ops, get_random), timed(ops, pop_random)]
+
+
+def bench(n: int, ops: int = 2000) -> None:
+    ops = max(1, min(ops, n // 2))
+    print(f"\n--- {n} songs ---   {'':>20} {'SongList':>13}  {'list':>13}  speedup")
+    songs = make_songs(n)
+
+    sl, plain = SongList(), []
+    row("append", n, timed(n, lambda: [sl.append(s) for s in songs]),
+        timed(n, lambda: [plain.append(s) for s in songs]))
+    for label, ours, base in zip(("insert(middle)", "getitem(random)", "pop(random)"),
+                                 positional_ops(sl, songs, ops, 42), positional_ops(plain, songs, ops, 42)):
+        row(label, ops, ours, base)
+
+    # remove by name: the old Playlist scanned the list, then popped by index
+    names = [f"Song {i}" for i in random.Random(7).sample(range(n), ops)]
+
+    def remove_songlist():
+        for name in names:
+            idx = sl.find_name(name)
+            if idx is not None:
+                del sl[idx]
+
+    # the list baseline scans O(n) per removal, so time fewer of them on big lists
+    slow_names = names[:max(10, min(ops, 10_000_000 // n))]
+
+    def remove_list():
+        for name in slow_names:
+            key = name.lower()
+            for i, s in enumerate(plain):
+                if s.name().lower() == key:
+                    plain.pop(i)
+                    break
+    row("remove by name", ops, timed(ops, remove_songlist), timed(len(slow_names), remove_list))
+
+    # recently played: OrderedDict LRU vs the old deque.remove + append
+    rng = random.Random(3)
+    picks = [songs[rng.randrange(n)] for _ in range(ops * 10)]
+    cap = max(5, n // 10)
+    recent, old = RecentlyPlayed(maxlen=cap), deque(maxlen=cap)
+
+    def touch_deque():
+        for s in picks:
+            try:
+                old.remove(s)
+            except ValueError:
+                pass
+            old.append(s)
+    row("recently played touch", len(picks), timed(len(picks), lambda: [recent.touch(s) for s in picks]),
+        timed(len(picks), touch_deque))
+
+    pl = Playlist(name="bench")
+    pl.songs = SongList(songs)
+    print(f"  {'Playlist.find':<24} {20:>7} ops  {timed(20, lambda: [pl.find('Artist 5') for _ in range(20)]):10.2f} us/op")
+
+
+def main(argv: List[str]) -> None:
+    sizes = [int(a) for a in argv] or [1_000, 10_000, 100_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
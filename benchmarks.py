@@ -0,0 +1,277 @@
+# Reproducible benchmarks for the hot paths of all six programs.
+#
+# Usage:
+#   python benchmarks.py                         # default scales 1k,10k,100k
+#   python benchmarks.py --scales 1000,1000000 --out results.json
+#   python benchmarks.py --compare baseline.json # flag regressions vs an earlier run
+#   python benchmarks.py --instrument            # also collect instrumentation stats
+#
+# Data is generated from a fixed seed so runs are comparable; results are written as JSON.
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ATM_simulator
+import instrumentation
+from ATM_simulator import Account, Bank
+from HR_management_system import FullTime, HRSystem, Intern, PartTime
+from MTB_system import Theater
+from grading_system import make_report
+from hospital_system import HospitalSystem, Patient
+from music_app import Playlist, Song, SongList
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+SEED = 1234
+
+# A case prepares state for n records (untimed) and returns (callable to time, ops per call).
+Case = Callable[[int, random.Random, str], Tuple[Callable[[], Any], int]]
+
+
+# ---------------- synthetic data ----------------
+def gen_employees(n: int, rng: random.Random) -> HRSystem:
+    hr = HRSystem()
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            hr.add_employee(FullTime(i, f"Emp {i}", base_salary=rng.uniform(20_000, 90_000),
+                                     benefits=rng.uniform(0, 5_000), performance_percent=rng.uniform(0, 20)))
+        elif kind == 1:
+            hr.add_employee(PartTime(i, f"Emp {i}", hourly_rate=rng.uniform(8, 40), hrs_worked=rng.uniform(10, 60)))
+        else:
+            hr.add_employee(Intern(i, f"Emp {i}", pocket_money=rng.uniform(1_000, 5_000),
+                                   project_completed=rng.random() < 0.5))
+    return hr
+
+
+def gen_patients(n: int, rng: random.Random, data_file: str) -> HospitalSystem:
+    hospital = HospitalSystem(data_file=data_file)
+    for i in range(1, n + 1):
+        p = Patient(i, f"Patient {i}", rng.randint(1, 95), f"98{rng.randint(10_000_000, 99_999_999)}")
+        p.record.add_diagnosis(rng.choice(["Flu", "Hypertension", "Diabetes", "Fracture"]), "Dr.Bench")
+        hospital.patients[i] = p
+    return hospital
+
+
+def gen_songs(n: int, rng: random.Random) -> List[Song]:
+    return [Song((f"Song {i}", f"Artist {rng.randrange(max(1, n // 10))}", rng.randint(90, 400))) for i in range(n)]
+
+
+# ---------------- cases ----------------
+def case_atm(n: int, rng: random.Random, tmp: str):
+    acct = Account("bench", opening_balance=float(n) * 10, mini_limit=5)
+    amounts = [round(rng.uniform(1, 10), 2) for _ in range(n)]
+
+    def run():
+        for i, amt in enumerate(amounts):
+            if i & 1:
+                acct.withdraw(amt)
+            else:
+                acct.deposit(amt)
+    return run, n
+
+
+def _replay_case(n: int, rng: random.Random, tmp: str, use_numpy: bool):
+    # half the rows are withdrawals from small balances, so a few percent overdraw and get rejected
+    accounts = max(1, n // 300)
+    path = os.path.join(tmp, f"replay_{n}.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("account_id,kind,amount\n")
+        for _ in range(n):
+            kind = "withdraw" if rng.random() < 0.5 else "deposit"
+            f.write(f"A{rng.randrange(accounts)},{kind},{rng.randint(100, 10_000) / 100}\n")
+    bank = Bank()
+    for i in range(accounts):
+        bank.open_account(f"A{i}", "bench", opening_balance=500)
+
+    def run():
+        saved = ATM_simulator.NUMPY_AVAILABLE
+        ATM_simulator.NUMPY_AVAILABLE = saved and use_numpy
+        try:
+            bank.replay(path)
+        finally:
+            ATM_simulator.NUMPY_AVAILABLE = saved
+    return run, n
+
+
+def case_bank_replay(n: int, rng: random.Random, tmp: str):
+    return _replay_case(n, rng, tmp, use_numpy=True)
+
+
+def case_bank_replay_rowwise(n: int, rng: random.Random, tmp: str):
+    return _replay_case(n, rng, tmp, use_numpy=False)
+
+
+def case_hr_payroll(n: int, rng: random.Random, tmp: str):
+    hr = gen_employees(n, rng)
+    return hr.total_payroll, n
+
+
+def case_mtb_booking(n: int, rng: random.Random, tmp: str):
+    seats_per_row = 100
+    rows = max(1, n // seats_per_row)
+    path = os.path.join(tmp, f"bookings_{n}.csv")
+    if os.path.exists(path):
+        os.remove(path)
+    theater = Theater(rows=rows, seats_per_row=seats_per_row, bookings_file=path)
+    order = [(r, s) for r in range(1, rows + 1) for s in range(1, seats_per_row + 1)]
+    rng.shuffle(order)
+
+    def run():
+        for r, s in order:
+            theater.book_seat(f"Guest {r}-{s}", r, s, is_student=(s % 4 == 0))
+    return run, len(order)
+
+
+def case_make_report(n: int, rng: random.Random, tmp: str):
+    marks = [rng.randint(0, 100) for _ in range(n)]
+    path = os.path.join(tmp, "report_bench.txt")
+    return (lambda: make_report("Bench Student", marks, path)), n
+
+
+def case_hospital_save(n: int, rng: random.Random, tmp: str):
+    hospital = gen_patients(n, rng, os.path.join(tmp, f"patients_save_{n}.json"))
+    return hospital._save, n
+
+
+def case_hospital_load(n: int, rng: random.Random, tmp: str):
+    path = os.path.join(tmp, f"patients_load_{n}.json")
+    gen_patients(n, rng, path)._save()
+    hospital = HospitalSystem(data_file=path)
+
+    def run():
+        hospital.patients = {}
+        hospital._load()
+    return run, n
+
+
+def case_playlist_find(n: int, rng: random.Random, tmp: str):
+    pl = Playlist(name="bench")
+    pl.songs = SongList(gen_songs(n, rng))
+    return (lambda: pl.find("artist 7")), n
+
+
+# name -> (case, largest n run by default; --no-limit lifts it)
+CASES: Dict[str, Tuple[Case, Optional[int]]] = {
+    "atm.deposit_withdraw": (case_atm, None),
+    "atm.Bank.replay": (case_bank_replay, None),
+    "atm.Bank.replay_rowwise": (case_bank_replay_rowwise, None),
+    "hr.total_payroll": (case_hr_payroll, None),
+    "mtb.book_seat": (case_mtb_booking, 100_000),
+    "grading.make_report": (case_make_report, None),
+    "hospital._save": (case_hospital_save, 100_000),
+    "hospital._load": (case_hospital_load, 100_000),
+    "music.Playlist.find": (case_playlist_find, None),
+}
+
+
+# ---------------- runner ----------------
+def run_case(name: str, case: Case, n: int, repeat: int, tmp: str) -> Dict[str, Any]:
+    times = []
+    ops = 0
+    for _ in range(repeat):
+        # fresh state per repeat so stateful cases (bookings, withdrawals) stay comparable;
+        # setup also calls instrumented methods (e.g. HospitalSystem._load), so keep it out of the stats
+        instrumenting = instrumentation.ENABLED
+        instrumentation.disable()
+        try:
+            fn, ops = case(n, random.Random(SEED), tmp)
+        finally:
+            if instrumenting:
+                instrumentation.enable()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "case": name,
+        "n": n,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(times),
+        "ns_per_op": best * 1e9 / max(ops, 1),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["case"], r["n"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nComparison against {baseline_path} (regression if slower by > {threshold:.0%}):")
+    for r in results:
+        old = baseline.get((r["case"], r["n"]))
+        if old is None:
+            continue
+        ratio = r["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"  {r['case']:<24} n={r['n']:<9} {ratio:6.2f}x {flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of the simulation projects.")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="comma-separated record counts, e.g. 1000,10000,1000000")
+    parser.add_argument("--cases", default="", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-limit", action="store_true", help="run file-heavy cases at every scale")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--instrument", action="store_true", help="collect instrumentation stats as well")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    selected = [c for c in args.cases.split(",") if c] or list(CASES)
+    unknown = set(selected) - CASES.keys()
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+    if args.instrument:
+        instrumentation.enable()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in selected:
+            case, limit = CASES[name]
+            for n in scales:
+                if limit is not None and n > limit and not args.no_limit:
+                    print(f"{name:<24} n={n:<9} skipped (above {limit}; use --no-limit)")
+                    continue
+                r = run_case(name, case, n, args.repeat, tmp)
+                results.append(r)
+                print(f"{name:<24} n={n:<9} best={r['best_s']:.4f}s  {r['ns_per_op']:10.1f} ns/op")
+
+    out = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": SEED,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.instrument:
+        out["instrumentation"] = instrumentation.report()
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# Runnable self-checks for the ATM ledger, journal and Bank code in ATM_simulator.py.
+# Usage: python check_atm.py   (exits non-zero on the first failed check)
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+
+import ATM_simulator
+from ATM_simulator import Bank, InsufficientFundError, LedgerAccount, to_cents
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def check_crash_after_ack_is_durable(tmp: str) -> None:
+    path = os.path.join(tmp, "crash.journal")
+    # os._exit skips close(), finalizers and atexit, like a killed process
+    script = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {HERE!r})\n"
+        "from ATM_simulator import LedgerAccount\n"
+        f"acct = LedgerAccount('x', {path!r}, opening_balance=100)\n"
+        "acct.deposit(5.5)\n"
+        "acct.withdraw(0.25)\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+    acct = LedgerAccount("x", path)
+    assert acct.get_balance_cents() == 10525, acct.get_balance_cents()
+    assert len(acct.mini_statement()) == 3
+    acct.close()
+
+
+def check_torn_record_is_dropped(tmp: str) -> None:
+    path = os.path.join(tmp, "torn.journal")
+    with LedgerAccount("x", path, opening_balance=10) as acct:
+        acct.deposit(1)
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"3,1.0,depo")
+    with LedgerAccount("x", path) as acct:
+        assert acct.get_balance_cents() == 1100
+        assert os.path.getsize(path) == size
+        acct.deposit(2)
+    with LedgerAccount("x", path) as acct:
+        assert acct.get_balance_cents() == 1300
+
+
+def check_snapshot_plus_tail(tmp: str) -> None:
+    path = os.path.join(tmp, "snap.journal")
+    with LedgerAccount("x", path, opening_balance=1, snapshot_every=7) as acct:
+        for i in range(1, 30):
+            acct.deposit(i / 100)
+    assert os.path.exists(path + ".snap")
+    expected = 100 + sum(range(1, 30))
+    with LedgerAccount("x", path, snapshot_every=7) as acct:
+        assert acct.get_balance_cents() == expected
+        assert acct.mini_statement()[0].endswith(f"Balance: {expected / 100:.2f}")
+
+
+def check_zero_mini_limit(tmp: str) -> None:
+    with LedgerAccount("x", os.path.join(tmp, "mini.journal"), opening_balance=1, mini_limit=0) as acct:
+        acct.deposit(1)
+        assert acct.mini_statement() == []
+
+
+def check_concurrent_deposits_are_durable(tmp: str) -> None:
+    path = os.path.join(tmp, "threads.journal")
+    acct = LedgerAccount("x", path)
+    workers = [threading.Thread(target=lambda: [acct.deposit(1) for _ in range(50)]) for _ in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    # no close(): every acknowledged deposit must already be on disk
+    assert LedgerAccount("x", path).get_balance_cents() == 8 * 50 * 100
+    acct.close()
+
+
+def check_invalid_amounts_rejected(tmp: str) -> None:
+    path = os.path.join(tmp, "amounts.journal")
+    with LedgerAccount("x", path, opening_balance=1) as acct:
+        for bad in (0.001, 0.004, float("inf"), float("-inf"), float("nan")):
+            for op in (acct.deposit, acct.withdraw):
+                try:
+                    op(bad)
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError(f"{op.__name__}({bad}) was accepted")
+        assert acct.journal.seq == 1
+        assert acct.get_balance_cents() == 100
+
+
+def check_transfer_is_atomic(tmp: str) -> None:
+    bank = Bank()
+    bank.open_account("plain", "o", opening_balance=10)
+    ledger = LedgerAccount("o", os.path.join(tmp, "dst.journal"), opening_balance=1)
+    bank.add_account("ledger", ledger)
+    try:
+        bank.transfer("plain", "ledger", 0.001)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("transfer of 0.001 was accepted")
+    assert bank.get_balance("plain") == 10 and ledger.get_balance_cents() == 100
+
+    ledger.close()
+    try:
+        bank.transfer("plain", "ledger", 4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("transfer into a closed journal succeeded")
+    assert bank.get_balance("plain") == 10 and ledger.get_balance_cents() == 100
+
+
+def check_concurrent_withdrawals_and_transfers(tmp: str) -> None:
+    bank = Bank()
+    bank.open_account("x", "o", opening_balance=100)
+    bank.open_account("y", "o", opening_balance=100)
+    txns = [("withdraw", "x", 1.0)] * 150 + [("transfer", "x", 1.0, "y"), ("transfer", "y", 1.0, "x")] * 200
+    results = bank.process(txns, workers=16)
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert all(isinstance(r, InsufficientFundError) for r in failures)
+    assert bank.get_balance("x") >= 0 and bank.get_balance("y") >= 0
+    # transfers conserve money, so only successful withdrawals change the total
+    withdrawn = sum(not isinstance(r, Exception) for r in results[:150])
+    assert withdrawn <= 100
+    assert bank.get_balance("x") + bank.get_balance("y") == 200 - withdrawn
+
+
+def _replay_bank() -> Bank:
+    bank = Bank()
+    for i in range(6):
+        acct = bank.open_account(f"A{i}", "o", opening_balance=0.7 + i)
+        acct.withdraw(0.4)  # leaves a float balance just under x.30
+    return bank
+
+
+def check_replay_paths_agree(tmp: str) -> None:
+    rng = random.Random(7)
+    path = os.path.join(tmp, "txns.csv")
+    for trial in range(40):
+        rows = []
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("account_id,kind,amount\n")
+            for _ in range(300):
+                row = (f"A{rng.randrange(6)}", rng.choice(["deposit", "withdraw", "withdraw"]),
+                       rng.choice([0.3, 0.1, 0.2, 1.3, rng.randint(1, 300) / 100]))
+                rows.append(row)
+                f.write(",".join(map(str, row)) + "\n")
+
+        # reference: strict in-order processing in paise
+        expected_balances = {a: to_cents(acct.get_balance()) for a, acct in _replay_bank().accounts.items()}
+        expected = []
+        for i, (a, kind, amount) in enumerate(rows):
+            cents = to_cents(amount) * (1 if kind == "deposit" else -1)
+            if expected_balances[a] + cents < 0:
+                expected.append(i)
+            else:
+                expected_balances[a] += cents
+
+        modes = [False, True] if ATM_simulator.NUMPY_AVAILABLE else [False]
+        saved = ATM_simulator.NUMPY_AVAILABLE
+        try:
+            for use_numpy in modes:
+                ATM_simulator.NUMPY_AVAILABLE = use_numpy
+                bank = _replay_bank()
+                rejected = bank.replay(path)
+                assert rejected == expected, (trial, use_numpy, rejected, expected)
+                for a, cents in expected_balances.items():
+                    assert to_cents(bank.get_balance(a)) == cents, (trial, use_numpy, a)
+                    latest = bank.get(a).mini_statement()[0]
+                    assert latest.endswith(f"Balance: {cents / 100:.2f}"), (trial, use_numpy, latest)
+        finally:
+            ATM_simulator.NUMPY_AVAILABLE = saved
+
+
+def check_replay_into_ledger_account(tmp: str) -> None:
+    bank = Bank()
+    bank.open_account("plain", "o", opening_balance=1)
+    bank.add_account("ledger", LedgerAccount("o", os.path.join(tmp, "replay.journal"), opening_balance=1))
+    path = os.path.join(tmp, "txns.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("account_id,kind,amount\n"
+                "ledger,withdraw,0.6\n"
+                "plain,withdraw,0.6\n"
+                "ledger,withdraw,0.6\n"
+                "plain,deposit,2\n"
+                "ledger,deposit,0.35\n")
+    assert bank.replay(path) == [2]
+    assert bank.get_balance("plain") == 2.4
+    bank.get("ledger").close()
+    # ledger rows went through deposit()/withdraw(), so they are journaled
+    with LedgerAccount("o", os.path.join(tmp, "replay.journal")) as ledger:
+        assert ledger.get_balance_cents() == 75
+        assert len(ledger.mini_statement()) == 3
+
+
+class _FailingFsync:
+    """Makes the next ``failures`` calls to os.fsync raise, as a flaky disk would."""
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self._real = os.fsync
+
+    def __call__(self, fd: int) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise OSError("injected fsync failure")
+        self._real(fd)
+
+    def __enter__(self) -> "_FailingFsync":
+        os.fsync = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        os.fsync = self._real
+
+
+def check_fsync_failure_leaves_journal_reopenable(tmp: str) -> None:
+    path = os.path.join(tmp, "fsync.journal")
+    acct = LedgerAccount("x", path, opening_balance=10)
+    size = os.path.getsize(path)
+    with _FailingFsync():
+        try:
+            acct.deposit(5)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("deposit survived a failed fsync")
+    # the failed batch was cut off and the balance never saw the deposit
+    assert os.path.getsize(path) == size
+    assert acct.get_balance_cents() == 1000
+    assert len(acct.mini_statement()) == 1
+    try:
+        acct.withdraw(1)
+    except OSError:
+        pass
+    else:
+        raise AssertionError("journal accepted a write after a failed fsync")
+    acct.close()
+    with LedgerAccount("x", path) as reopened:
+        assert reopened.get_balance_cents() == 1000
+        reopened.deposit(2)
+    with LedgerAccount("x", path) as reopened:
+        assert reopened.get_balance_cents() == 1200
+
+
+CHECKS = [
+    check_crash_after_ack_is_durable,
+    check_torn_record_is_dropped,
+    check_snapshot_plus_tail,
+    check_zero_mini_limit,
+    check_concurrent_deposits_are_durable,
+    check_invalid_amounts_rejected,
+    check_fsync_failure_leaves_journal_reopenable,
+    check_transfer_is_atomic,
+    check_concurrent_withdrawals_and_transfers,
+    check_replay_paths_agree,
+    check_replay_into_ledger_account,
+]
+
+
+def main() -> None:
+    for check in CHECKS:
+        with tempfile.TemporaryDirectory() as tmp:
+            check(tmp)
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
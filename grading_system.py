@@ -1,4 +1,5 @@
 from typing import List
+from instrumentation import file_bytes,instrument
 
 def input_mark(subject_no:int)->int:
     while True:
@@ -25,6 +26,7 @@ def letter_grade(percentage:float)->str:
                 else:
                     return "E"
 
+@instrument("make_report")
 def make_report(name:str,marks:List[int],filename:str)->None:
     total=sum(marks)
     percentage=total/len(marks)
@@ -45,7 +47,7 @@ def make_report(name:str,marks:List[int],filename:str)->None:
         print(line)
     print("----------------------\n")
 
-    with open (filename,"w",encoding="utf-8")as f:
+    with open (filename,"w",encoding="utf-8")as f,file_bytes("make_report",f):
         f.write("\n".join(lines))
     print(f"Report saved to {filename}")
 
@@ -1,6 +1,7 @@
 import json
 from typing import Dict,Any,List,Optional
 from datetime import datetime
+from instrumentation import file_bytes,instrument
 
 DATA_FILE="patients.json"
 
@@ -120,11 +121,13 @@ class HospitalSystem:
     def list_patients(self)->List[Dict[str,Any]]:
         return [p.to_dict() for p in self.patients.values()]
     
+    @instrument("HospitalSystem._save")
     def _save(self)->None:
         data=[p.to_dict() for p in self.patients.values()]
-        with open(self.data_file,"w",encoding="utf-8") as f:
+        with open(self.data_file,"w",encoding="utf-8") as f,file_bytes("HospitalSystem._save",f):
             json.dump(data,f,indent=2)
     
+    @instrument("HospitalSystem._load")
     def _load(self)->None:
         try:
             with open(self.data_file,"r",encoding="utf-8") as f:
@@ -0,0 +1,148 @@
+# Opt-in timing hooks for the hot paths of the simulation projects.
+#
+# Disabled by default; turn on with enable() or SIM_INSTRUMENT=1 in the environment.
+# While disabled an instrumented call costs one global flag check.
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, Optional
+
+ENABLED = os.environ.get("SIM_INSTRUMENT", "") not in ("", "0")
+
+_lock = threading.Lock()
+
+
+class Stats:
+    """Call count, latency histogram (power-of-two ns buckets) and bytes written for one name."""
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns", "buckets", "bytes_written")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+        self.buckets: Dict[int, int] = {}
+        self.bytes_written = 0
+
+    def add(self, ns: int) -> None:
+        self.calls += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        # bucket b holds latencies in [2**(b-1), 2**b) ns
+        b = ns.bit_length()
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.calls if self.calls else 0.0,
+            "min_ns": self.min_ns or 0,
+            "max_ns": self.max_ns,
+            "histogram_ns": {f"<{1 << b}": n for b, n in sorted(self.buckets.items())},
+            "bytes_written": self.bytes_written,
+        }
+
+
+_stats: Dict[str, Stats] = {}
+
+
+def _get(name: str) -> Stats:
+    # caller holds _lock
+    st = _stats.get(name)
+    if st is None:
+        st = _stats[name] = Stats()
+    return st
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def instrument(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording calls and latency of ``fn`` under ``name`` (default: its qualname)."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                with _lock:
+                    _get(label).add(elapsed)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Context-manager form of instrument() for timing a block."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        with _lock:
+            _get(name).add(elapsed)
+
+
+def add_bytes(name: str, nbytes: int) -> None:
+    """Record ``nbytes`` written by ``name``. Callers should check ENABLED first if measuring is costly."""
+    if not ENABLED:
+        return
+    with _lock:
+        _get(name).bytes_written += int(nbytes)
+
+
+@contextmanager
+def file_bytes(name: str, f: IO) -> Iterator[None]:
+    """Record the bytes written to ``f`` inside the block under ``name`` (from ``f.tell()``)."""
+    if not ENABLED:
+        yield
+        return
+    start = f.tell()
+    try:
+        yield
+    finally:
+        add_bytes(name, f.tell() - start)
+
+
+def report() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {name: st.to_dict() for name, st in sorted(_stats.items())}
+
+
+def dump_json(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, indent=2)
+
+
+def print_report() -> None:
+    for name, st in report().items():
+        print(f"{name:<32} calls={st['calls']:<8} mean={st['mean_ns'] / 1000:9.2f}us "
+              f"max={st['max_ns'] / 1000:9.2f}us bytes={st['bytes_written']}")
@@ -1,9 +1,12 @@
-from typing import List, Tuple, Deque, Optional
-from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+from collections import OrderedDict
+import heapq
 import random
 import time
 import os
 
+from instrumentation import instrument
+
 # Try importing pygame for real playback; if unavailable we will simulate.
 try:
     import pygame
@@ -96,12 +99,283 @@ class OnlineSong(Song):
         return f"OnlineSong({self.info}, '{self.stream_url}', provider='{self.provider}')"
 
 
+class RecentlyPlayed:
+    """LRU of recently played songs (OrderedDict) plus lifetime play counts.
+
+    Touching a song moves it to the newest end in O(1); the oldest entry is
+    evicted once ``maxlen`` is exceeded. Play counts survive eviction.
+    """
+    def __init__(self, maxlen: int = 5):
+        self.maxlen = int(maxlen)
+        self._order: "OrderedDict[Song, None]" = OrderedDict()
+        self.play_counts: Dict[Song, int] = {}
+
+    def touch(self, song: Song) -> None:
+        self.play_counts[song] = self.play_counts.get(song, 0) + 1
+        if song in self._order:
+            self._order.move_to_end(song)
+            return
+        self._order[song] = None
+        if len(self._order) > self.maxlen:
+            self._order.popitem(last=False)
+
+    def most_played(self, n: int = 5) -> List[Tuple[Song, int]]:
+        return heapq.nlargest(n, self.play_counts.items(), key=lambda kv: kv[1])
+
+    def clear(self) -> None:
+        self._order.clear()
+        self.play_counts.clear()
+
+    def __iter__(self) -> Iterator[Song]:
+        # oldest -> newest, same order the old deque used
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, song: object) -> bool:
+        return song in self._order
+
+
+class _Entry:
+    """One slot in a SongList; remembers which chunk currently holds it."""
+    __slots__ = ("song", "chunk")
+
+    def __init__(self, song: Song, chunk: "_Chunk"):
+        self.song = song
+        self.chunk = chunk
+
+
+class _Chunk:
+    __slots__ = ("entries", "idx")
+
+    def __init__(self, entries: Optional[List[_Entry]] = None):
+        self.entries: List[_Entry] = entries if entries is not None else []
+        self.idx = 0  # position in SongList._chunks, kept current by _rebuild()
+
+
+class SongList:
+    """Chunked list of songs for large playlists.
+
+    Songs live in chunks of at most ``2 * chunk_size`` entries and a Fenwick
+    tree over the chunk lengths maps a list index to its chunk in O(log n),
+    so indexing, insert and pop cost O(log n + chunk_size) instead of O(n).
+    Splitting or dropping a chunk renumbers the chunks, which happens at most
+    once per ~chunk_size edits. Name and identity indexes make ``remove`` and
+    name lookup independent of where the song sits. Behaves like a list for
+    indexing, iteration and len().
+    """
+    def __init__(self, songs: Iterable[Song] = (), chunk_size: int = 512):
+        self._chunk_size = max(2, int(chunk_size))
+        self._chunks: List[_Chunk] = []
+        self._tree: List[int] = [0]
+        self._len = 0
+        self._by_name: Dict[str, Dict[_Entry, None]] = {}
+        self._by_id: Dict[int, Dict[_Entry, None]] = {}
+        chunk = None
+        for song in songs:
+            if chunk is None or len(chunk.entries) >= self._chunk_size:
+                chunk = _Chunk()
+                self._chunks.append(chunk)
+            entry = _Entry(song, chunk)
+            chunk.entries.append(entry)
+            self._index_entry(entry)
+            self._len += 1
+        self._rebuild()
+
+    # index bookkeeping
+    def _index_entry(self, entry: _Entry) -> None:
+        self._by_name.setdefault(entry.song.name().lower(), {})[entry] = None
+        self._by_id.setdefault(id(entry.song), {})[entry] = None
+
+    def _unindex_entry(self, entry: _Entry) -> None:
+        for index, key in ((self._by_name, entry.song.name().lower()), (self._by_id, id(entry.song))):
+            bucket = index[key]
+            del bucket[entry]
+            if not bucket:
+                del index[key]
+
+    # Fenwick tree over chunk lengths: _tree[j] covers chunks (j - lowbit(j), j]
+    def _rebuild(self) -> None:
+        m = len(self._chunks)
+        tree = [0] * (m + 1)
+        for j, chunk in enumerate(self._chunks, start=1):
+            chunk.idx = j - 1
+            tree[j] += len(chunk.entries)
+            parent = j + (j & -j)
+            if parent <= m:
+                tree[parent] += tree[j]
+        self._tree = tree
+
+    def _grow(self, ci: int, delta: int) -> None:
+        tree = self._tree
+        j = ci + 1
+        while j < len(tree):
+            tree[j] += delta
+            j += j & -j
+
+    def _chunk_start(self, ci: int) -> int:
+        """Number of songs in chunks before chunk ``ci``."""
+        tree = self._tree
+        total = 0
+        while ci > 0:
+            total += tree[ci]
+            ci -= ci & -ci
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Map a list index to (chunk number, offset inside that chunk)."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SongList index out of range")
+        tree = self._tree
+        m = len(tree) - 1
+        pos = 0
+        step = 1 << (m.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= m and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
+
+    def _position(self, entry: _Entry) -> int:
+        chunk = entry.chunk
+        return self._chunk_start(chunk.idx) + chunk.entries.index(entry)
+
+    def _split(self, ci: int) -> None:
+        chunk = self._chunks[ci]
+        if len(chunk.entries) <= 2 * self._chunk_size:
+            return
+        half = len(chunk.entries) // 2
+        moved = _Chunk(chunk.entries[half:])
+        del chunk.entries[half:]
+        for entry in moved.entries:
+            entry.chunk = moved
+        self._chunks.insert(ci + 1, moved)
+        self._rebuild()
+
+    def _shrink(self, ci: int) -> None:
+        chunk = self._chunks[ci]
+        if not chunk.entries:
+            del self._chunks[ci]
+            self._rebuild()
+            return
+        # fold small chunks into the previous one so chunk count stays bounded
+        if ci > 0 and len(chunk.entries) < self._chunk_size // 4:
+            prev = self._chunks[ci - 1]
+            if len(prev.entries) + len(chunk.entries) <= 2 * self._chunk_size:
+                for entry in chunk.entries:
+                    entry.chunk = prev
+                prev.entries.extend(chunk.entries)
+                del self._chunks[ci]
+                self._rebuild()
+
+    def _delete_at(self, ci: int, offset: int) -> Song:
+        entry = self._chunks[ci].entries.pop(offset)
+        self._unindex_entry(entry)
+        self._len -= 1
+        self._grow(ci, -1)
+        self._shrink(ci)
+        return entry.song
+
+    # list-like API
+    def append(self, song: Song) -> None:
+        if not self._chunks:
+            self._chunks.append(_Chunk())
+            self._rebuild()
+        ci = len(self._chunks) - 1
+        chunk = self._chunks[ci]
+        entry = _Entry(song, chunk)
+        chunk.entries.append(entry)
+        self._index_entry(entry)
+        self._len += 1
+        self._grow(ci, 1)
+        self._split(ci)
+
+    def insert(self, index: int, song: Song) -> None:
+        if index < 0:
+            index = max(0, index + self._len)
+        if index >= self._len:
+            self.append(song)
+            return
+        ci, offset = self._locate(index)
+        chunk = self._chunks[ci]
+        entry = _Entry(song, chunk)
+        chunk.entries.insert(offset, entry)
+        self._index_entry(entry)
+        self._len += 1
+        self._grow(ci, 1)
+        self._split(ci)
+
+    def pop(self, index: int = -1) -> Song:
+        if not self._len:
+            raise IndexError("pop from empty SongList")
+        ci, offset = self._locate(index)
+        return self._delete_at(ci, offset)
+
+    def remove(self, song: Song) -> None:
+        """Remove the first occurrence of ``song`` (by identity)."""
+        pos = self.index(song)
+        del self[pos]
+
+    def index(self, song: Song) -> int:
+        bucket = self._by_id.get(id(song))
+        if not bucket:
+            raise ValueError(f"{song!r} is not in SongList")
+        return min(self._position(e) for e in bucket)
+
+    def find_name(self, name: str) -> Optional[int]:
+        """Position of the first song whose name matches (case-insensitive)."""
+        bucket = self._by_name.get(name.lower())
+        if not bucket:
+            return None
+        return min(self._position(e) for e in bucket)
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._tree = [0]
+        self._by_name.clear()
+        self._by_id.clear()
+        self._len = 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        ci, offset = self._locate(index)
+        return self._chunks[ci].entries[offset].song
+
+    def __setitem__(self, index: int, song: Song) -> None:
+        ci, offset = self._locate(index)
+        entry = self._chunks[ci].entries[offset]
+        self._unindex_entry(entry)
+        entry.song = song
+        self._index_entry(entry)
+
+    def __delitem__(self, index: int) -> None:
+        ci, offset = self._locate(index)
+        self._delete_at(ci, offset)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Song]:
+        for chunk in self._chunks:
+            for entry in chunk.entries:
+                yield entry.song
+
+    def __repr__(self):
+        return f"SongList({list(self)!r})"
+
+
 class Playlist:
     """Playlist stores Song objects and manages recently played, shuffle, search, etc."""
     def __init__(self, name: str = "My Playlist", recently_played_capacity: int = 5):
         self.name = name
-        self.songs: List[Song] = []
-        self.recently_played: Deque[Song] = deque(maxlen=recently_played_capacity)
+        self.songs: SongList = SongList()
+        self.recently_played: RecentlyPlayed = RecentlyPlayed(maxlen=recently_played_capacity)
 
     # Add / remove
     def add_song(self, song: Song) -> None:
@@ -117,9 +391,9 @@ class Playlist:
         return None
 
     def remove_song_by_name(self, name: str) -> Optional[Song]:
-        for i, s in enumerate(self.songs):
-            if s.name().lower() == name.lower():
-                return self.remove_song_by_index(i)
+        i = self.songs.find_name(name)
+        if i is not None:
+            return self.remove_song_by_index(i)
         print(f"No song named '{name}' found.")
         return None
 
@@ -151,12 +425,8 @@ class Playlist:
         self.play_song(1)
 
     def _add_to_recent(self, song: Song) -> None:
-        # Keep uniqueness in recently_played and append as most recent
-        try:
-            self.recently_played.remove(song)
-        except ValueError:
-            pass
-        self.recently_played.append(song)
+        # Keep uniqueness in recently_played and move to most recent
+        self.recently_played.touch(song)
 
     def show_recent(self) -> None:
         if not self.recently_played:
@@ -166,11 +436,24 @@ class Playlist:
         for s in self.recently_played:
             print(f"- {s.name()} by {s.artist()} [{s._fmt_length()}]")
 
+    def show_most_played(self, n: int = 5) -> None:
+        stats = self.recently_played.most_played(n)
+        if not stats:
+            print("No songs played yet.")
+            return
+        print("Most played:")
+        for s, count in stats:
+            print(f"- {s.name()} by {s.artist()} — {count} plays")
+
     # Shuffle / search / clear
     def shuffle(self) -> None:
-        random.shuffle(self.songs)
+        # shuffle a flat copy and rebuild; swapping in place would relocate every index
+        songs = list(self.songs)
+        random.shuffle(songs)
+        self.songs = SongList(songs)
         print("Playlist shuffled.")
 
+    @instrument("Playlist.find")
     def find(self, query: str) -> List[int]:
         q = query.lower()
         return [i + 1 for i, s in enumerate(self.songs) if q in s.name().lower() or q in s.artist().lower()]